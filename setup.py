@@ -1,7 +1,6 @@
 from setuptools import setup, find_packages
 import pathlib
 import numpy as np
-from Cython.Build import cythonize
 
 cwd = pathlib.Path("./")
 src = cwd / "tobac_flow"
@@ -11,6 +10,14 @@ packages = ["tobac_flow"] + [
 modules = sorted([str(f.relative_to(f.parts[0])) for f in src.glob("**/[a-z]*.py")])
 cython_modules = [str(f) for f in src.glob("*.pyx")]
 
+# Only import and run Cython if there are extension modules to build
+if cython_modules:
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(cython_modules)
+else:
+    ext_modules = []
+
 setup(
     name="tobac-flow",
     version="1.8.2",
@@ -24,7 +31,7 @@ setup(
     # py_modules=modules,
     include_package_data=True,
     install_requires=[],
-    ext_modules=cythonize(cython_modules),
+    ext_modules=ext_modules,
     include_dirs=[np.get_include()],
     zip_safe=False,
 )
@@ -46,3 +46,19 @@ def test_mask_labels():
         analysis.mask_labels(one_label, empty_array)[0] == False
     ), "Mask should be False"
     assert analysis.mask_labels(one_label, one_label)[0] == True, "Mask should be True"
+
+
+def test_label_statistics():
+    from tobac_flow.utils.numba_utils import label_statistics
+
+    labels = np.array([0, 1, 1, 2, 2, 2, 0, 3]).astype(int)
+    field = np.array([5.0, 1.0, 3.0, 2.0, np.nan, 4.0, 0.0, np.nan])
+
+    mean, std, maximum, minimum = label_statistics(labels, field)
+
+    assert np.allclose(mean[:2], [2.0, 3.0])
+    assert np.allclose(std[:2], [1.0, 1.0])
+    assert np.allclose(maximum[:2], [3.0, 4.0])
+    assert np.allclose(minimum[:2], [1.0, 2.0])
+    # Label 3 has no finite values, so should return NaN for all statistics
+    assert np.all(np.isnan([mean[2], std[2], maximum[2], minimum[2]]))
@@ -410,3 +410,24 @@ def test_flow_getitem() -> None:
     zeros = np.zeros([3, 5, 2])
     flow_obj = flow.Flow(zeros, zeros)
     assert flow_obj[:2, :4].shape == (2, 4)
+
+
+def test_flow_convolve_in_place() -> None:
+    """
+    Test that convolving with res set to the data array gives the same result
+        as an out of place convolution
+    """
+    zeros = np.zeros([4, 5, 6, 2], dtype=np.float32)
+    flow_obj = flow.Flow(zeros, zeros)
+    data = np.arange(120, dtype=np.float32).reshape(4, 5, 6)
+    data[0, 0, 0] = np.nan
+    structure = np.zeros([3, 3, 3])
+    structure[:, 1, 1] = 1
+    expected = flow_obj.convolve(
+        data.copy(), structure=structure, func=lambda x: np.nanmean(x, 0)
+    )
+    result = flow_obj.convolve(
+        data, structure=structure, func=lambda x: np.nanmean(x, 0), res=data
+    )
+    assert result is data
+    assert np.allclose(expected, result, equal_nan=True)
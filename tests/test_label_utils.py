@@ -118,3 +118,45 @@ def test_slice_labels():
         if i > 0:
             wh_label_i_dim = np.where(test_result == i)[0]
             assert np.all(wh_label_i_dim == wh_label_i_dim[0])
+
+
+def test_apply_func_to_labels_ndi_reductions():
+    from tobac_flow.utils.label_utils import apply_func_to_labels
+
+    test_labels = np.zeros([4, 6])
+    test_labels[1:3, 1:3] = 1
+    test_labels[2:3, 3:6] = 3
+    test_labels = test_labels.astype(int)
+    test_data = np.arange(24, dtype=float).reshape([4, 6])
+    test_data[2, 4] = np.nan
+
+    general_mean = apply_func_to_labels(
+        test_labels, test_data, func=lambda a: np.nanmean(a), default=np.nan
+    )
+    reduced_mean = apply_func_to_labels(
+        test_labels, test_data, func=np.nanmean, default=np.nan
+    )
+    assert np.allclose(general_mean, reduced_mean, equal_nan=True)
+
+    for func in (np.nanstd, np.nanmax, np.nanmin):
+        general = apply_func_to_labels(
+            test_labels, test_data, func=lambda a: func(a), default=np.nan
+        )
+        reduced = apply_func_to_labels(
+            test_labels, test_data, func=func, default=np.nan
+        )
+        assert np.allclose(general, reduced, equal_nan=True)
+
+    assert np.allclose(
+        apply_func_to_labels(
+            test_labels, test_data, func=np.nanmean, index=[1, 2, 3], default=-1
+        ),
+        apply_func_to_labels(
+            test_labels,
+            test_data,
+            func=lambda a: np.nanmean(a),
+            index=[1, 2, 3],
+            default=-1,
+        ),
+        equal_nan=True,
+    )
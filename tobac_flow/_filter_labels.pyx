@@ -0,0 +1,31 @@
+"""_filter_labels.pyx - cython implementation of the remap gather step used
+by the filter_labels_by_* family of functions in tobac_flow.analysis
+"""
+
+import numpy as np
+
+cimport numpy as cnp
+cimport cython
+from cython.parallel import prange
+
+cnp.import_array()
+
+ctypedef cnp.int32_t DTYPE_INT32_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def remap_gather(
+    DTYPE_INT32_t[::1] labels,
+    DTYPE_INT32_t[::1] remap,
+    DTYPE_INT32_t[::1] out,
+):
+    """
+    Gather remap[labels] into out over the raveled label array. All inputs
+    must be contiguous int32 arrays, with remap having a length of at least
+    labels.max() + 1
+    """
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = labels.shape[0]
+    for i in prange(n, nogil=True):
+        out[i] = remap[labels[i]]
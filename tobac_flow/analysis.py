@@ -9,6 +9,36 @@ from tobac_flow.utils.legacy_utils import (
     apply_func_to_labels,
     apply_weighted_func_to_labels,
 )
+from tobac_flow.utils.numba_utils import (
+    label_statistics,
+    labels_any_multimask,
+    weighted_label_statistics,
+)
+
+try:
+    from tobac_flow._filter_labels import remap_gather
+except ImportError:
+    remap_gather = None
+
+
+def _apply_remap(
+    labels: np.ndarray[int], remap: np.ndarray[int]
+) -> np.ndarray[int]:
+    """
+    Gather remap[labels] using the typed cython kernel where possible, falling
+        back to numpy fancy indexing for other dtypes or if the extension
+        module is unavailable
+    """
+    if (
+        remap_gather is not None
+        and labels.dtype == np.int32
+        and labels.flags.c_contiguous
+    ):
+        remap = np.ascontiguousarray(remap, dtype=np.int32)
+        out = np.empty_like(labels)
+        remap_gather(labels.ravel(), remap, out.ravel())
+        return out
+    return remap[labels]
 
 
 def find_object_lengths(labels: np.ndarray[int], axis: int = 0) -> np.ndarray[int]:
@@ -27,14 +57,23 @@ def find_object_lengths(labels: np.ndarray[int], axis: int = 0) -> np.ndarray[in
     object_lengths : numpy.ndarray
         The length of each label in the leading dimension
     """
-    object_lengths = np.array(
-        [o[axis].stop - o[axis].start for o in ndi.find_objects(labels)]
+    # fromiter writes directly into a typed buffer, skipping the intermediate
+    # list of Python ints
+    object_lengths = np.fromiter(
+        (
+            o[axis].stop - o[axis].start
+            for o in ndi.find_objects(labels)
+            if o is not None
+        ),
+        dtype=np.intp,
     )
 
     return object_lengths
 
 
-def mask_labels(labels: np.ndarray[int], mask: np.ndarray[bool]) -> np.ndarray[bool]:
+def mask_labels(
+    labels: np.ndarray[int], mask: np.ndarray[bool], nlabels: int | None = None
+) -> np.ndarray[bool]:
     """
     Apply a mask to an array of labelled regions to find which labels overlap
         the mask array
@@ -46,6 +85,8 @@ def mask_labels(labels: np.ndarray[int], mask: np.ndarray[bool]) -> np.ndarray[b
     mask : numpy.ndarray
         The mask to apply to the labeled array. Must have the same shape as
             labels
+    nlabels : int, optional (default : None)
+        The maximum label value, if already known
 
     Returns
     -------
@@ -56,10 +97,11 @@ def mask_labels(labels: np.ndarray[int], mask: np.ndarray[bool]) -> np.ndarray[b
     assert (
         labels.shape == mask.shape
     ), "Labels and mask parameters must have the same shape"
-    masked_labels = np.unique(labels[mask])
-    output = np.zeros(labels.max() + 1, dtype=bool)
-    output[masked_labels] = True
-    return output[1:]
+    if nlabels is None:
+        nlabels = int(labels.max())
+    mask = np.asarray(mask)
+    output = np.bincount(labels.ravel()[mask.ravel()], minlength=nlabels + 1) > 0
+    return output[1 : nlabels + 1]
 
 
 def remap_labels(
@@ -88,94 +130,97 @@ def remap_labels(
     assert (
         locations.size == labels.max()
     ), "The size of the locations parameter must be equal to the maximum label in the labels parameter"
-    remapper = np.zeros(np.nanmax(labels) + 1, labels.dtype)
+    remapper = np.zeros(labels.max() + 1, labels.dtype)
     if locations.dtype == bool:
-        remapper[1:][locations] = np.arange(1, np.sum(locations) + 1)
+        remapper[1:] = np.cumsum(locations, dtype=labels.dtype) * locations
     else:
         remapper[locations] = np.arange(1, np.sum(locations) + 1)
-    remapped_labels = remapper[labels]
+    # np.take avoids the advanced-indexing dispatch of remapper[labels]
+    remapped_labels = np.take(remapper, labels)
 
     return remapped_labels
 
 
-def filter_labels_by_length(labels, min_length):
-    wh = (
-        np.array([o[0].stop - o[0].start for o in ndi.find_objects(labels)])
-        >= min_length
-    )
+def filter_labels_by_length(labels, min_length, nlabels=None, object_slices=None):
+    if nlabels is None:
+        nlabels = int(labels.max())
+    if object_slices is None:
+        object_slices = ndi.find_objects(labels, max_label=nlabels)
 
-    remap = np.zeros([np.nanmax(labels) + 1], labels.dtype)
-    remap[1:] = np.cumsum(wh) * wh
+    wh = np.array([o[0].stop - o[0].start for o in object_slices]) >= min_length
 
-    return remap[labels]
+    remap = np.zeros([nlabels + 1], labels.dtype)
+    remap[1:] = np.cumsum(wh, dtype=labels.dtype) * wh
 
+    return _apply_remap(labels, remap)
 
-def filter_labels_by_mask(labels, mask):
-    wh = ndi.labeled_comprehension(
-        mask, labels, range(1, np.nanmax(labels) + 1), np.any, None, None
-    )
 
-    remap = np.zeros([np.nanmax(labels) + 1], labels.dtype)
-    remap[1:] = np.cumsum(wh) * wh
+def filter_labels_by_mask(labels, mask, nlabels=None):
+    if nlabels is None:
+        nlabels = int(labels.max())
 
-    return remap[labels]
+    wh = mask_labels(labels, mask, nlabels=nlabels)
+
+    remap = np.zeros([nlabels + 1], labels.dtype)
+    remap[1:] = np.cumsum(wh, dtype=labels.dtype) * wh
+
+    return _apply_remap(labels, remap)
 
 
-def filter_labels_by_length_and_mask(labels, mask, min_length):
+def filter_labels_by_length_and_mask(
+    labels, mask, min_length, nlabels=None, object_slices=None
+):
+    if nlabels is None:
+        nlabels = int(labels.max())
+    if object_slices is None:
+        object_slices = ndi.find_objects(labels, max_label=nlabels)
+
     wh = np.logical_and(
-        np.array([o[0].stop - o[0].start for o in ndi.find_objects(labels)])
-        >= min_length,
-        ndi.labeled_comprehension(
-            mask, labels, range(1, np.nanmax(labels) + 1), np.any, None, None
-        ),
+        np.array([o[0].stop - o[0].start for o in object_slices]) >= min_length,
+        mask_labels(labels, mask, nlabels=nlabels),
     )
 
-    remap = np.zeros([np.nanmax(labels) + 1], labels.dtype)
-    remap[1:] = np.cumsum(wh) * wh
+    remap = np.zeros([nlabels + 1], labels.dtype)
+    remap[1:] = np.cumsum(wh, dtype=labels.dtype) * wh
 
-    return remap[labels]
+    return _apply_remap(labels, remap)
 
 
-def filter_labels_by_multimask(labels, masks):
+def filter_labels_by_multimask(labels, masks, nlabels=None):
     if type(masks) is not type(list()):
         raise ValueError("masks input must be a list of masks to process")
 
-    wh = np.logical_and.reduce(
-        [
-            ndi.labeled_comprehension(
-                m, labels, range(1, np.nanmax(labels) + 1), np.any, np.bool8, 0
-            )
-            for m in masks
-        ]
-    )
+    if nlabels is None:
+        nlabels = int(labels.max())
 
-    remap = np.zeros([np.nanmax(labels) + 1], labels.dtype)
-    remap[1:] = np.cumsum(wh) * wh
+    wh = labels_any_multimask(labels, masks, nlabels=nlabels)
 
-    return remap[labels]
+    remap = np.zeros([nlabels + 1], labels.dtype)
+    remap[1:] = np.cumsum(wh, dtype=labels.dtype) * wh
+
+    return _apply_remap(labels, remap)
 
 
-def filter_labels_by_length_and_multimask(labels, masks, min_length):
+def filter_labels_by_length_and_multimask(
+    labels, masks, min_length, nlabels=None, object_slices=None
+):
     if type(masks) is not type(list()):
         raise ValueError("masks input must be a list of masks to process")
 
+    if nlabels is None:
+        nlabels = int(labels.max())
+    if object_slices is None:
+        object_slices = ndi.find_objects(labels, max_label=nlabels)
+
     wh = np.logical_and(
-        np.array([o[0].stop - o[0].start for o in ndi.find_objects(labels)])
-        >= min_length,
-        np.logical_and.reduce(
-            [
-                ndi.labeled_comprehension(
-                    m, labels, range(1, np.nanmax(labels) + 1), np.any, np.bool8, 0
-                )
-                for m in masks
-            ]
-        ),
+        np.array([o[0].stop - o[0].start for o in object_slices]) >= min_length,
+        labels_any_multimask(labels, masks, nlabels=nlabels),
     )
 
-    remap = np.zeros([np.nanmax(labels) + 1], labels.dtype)
-    remap[1:] = np.cumsum(wh) * wh
+    remap = np.zeros([nlabels + 1], labels.dtype)
+    remap[1:] = np.cumsum(wh, dtype=labels.dtype) * wh
 
-    return remap[labels]
+    return _apply_remap(labels, remap)
 
 
 def filter_labels_by_length_legacy(labels, min_length):
@@ -241,8 +286,11 @@ def get_stats_for_labels(labels, da, dim=None, dtype=None):
         dim = labels.name.split("_label")[0]
     if dtype is None:
         dtype = da.dtype
+    mean_values, std_values, max_values, min_values = label_statistics(
+        labels.data, da.data
+    )
     mean_da = create_dataarray(
-        apply_func_to_labels(labels.data, da.data, np.nanmean),
+        mean_values,
         (dim,),
         f"{dim}_{da.name}_mean",
         long_name=f"Mean of {da.long_name} for each {dim}",
@@ -250,7 +298,7 @@ def get_stats_for_labels(labels, da, dim=None, dtype=None):
         dtype=dtype,
     )
     std_da = create_dataarray(
-        apply_func_to_labels(labels.data, da.data, np.nanstd),
+        std_values,
         (dim,),
         f"{dim}_{da.name}_std",
         long_name=f"Standard deviation of {da.long_name} for each {dim}",
@@ -258,7 +306,7 @@ def get_stats_for_labels(labels, da, dim=None, dtype=None):
         dtype=dtype,
     )
     max_da = create_dataarray(
-        apply_func_to_labels(labels.data, da.data, np.nanmax),
+        max_values,
         (dim,),
         f"{dim}_{da.name}_max",
         long_name=f"Maximum of {da.long_name} for each {dim}",
@@ -266,7 +314,7 @@ def get_stats_for_labels(labels, da, dim=None, dtype=None):
         dtype=dtype,
     )
     min_da = create_dataarray(
-        apply_func_to_labels(labels.data, da.data, np.nanmin),
+        min_values,
         (dim,),
         f"{dim}_{da.name}_min",
         long_name=f"Minimum of {da.long_name} for each {dim}",
@@ -341,41 +389,12 @@ def weighted_statistics_on_labels(labels, da, weights, name=None, dim=None, dtyp
     except AttributeError:
         units = ""
 
-    def weighted_average(values, weights, ignore_nan=True):
-        if ignore_nan:
-            wh_nan = np.isnan(values)
-            values = values[~wh_nan]
-            weights = weights[~wh_nan]
-
-        if np.nansum(weights) == 0:
-            return np.nan
-
-        return np.average(values, weights=weights)
-
-    weighted_std = (
-        lambda x, w: weighted_average((x - weighted_average(x, w)) ** 2, w) ** 0.5
-    )
-    weighted_stats = (
-        lambda x, w: [
-            weighted_average(x, w),
-            weighted_std(x, w),
-            np.nanmax(x[w > 0]),
-            np.nanmin(x[w > 0]),
-        ]
-        if np.nansum(w) > 0
-        else [np.nan, np.nan, np.nan, np.nan]
-    )
-
-    stats_array = apply_weighted_func_to_labels(
-        labels.data,
-        da.data,
-        weights,
-        weighted_stats,
-        default=[np.nan, np.nan, np.nan, np.nan],
+    mean_values, std_values, max_values, min_values = weighted_label_statistics(
+        labels.data, da.data, weights
     )
 
     mean_da = create_dataarray(
-        stats_array[..., 0],
+        mean_values,
         (dim,),
         f"{name}_{da.name}_mean",
         long_name=f"Mean of {long_name} for each {dim}",
@@ -384,7 +403,7 @@ def weighted_statistics_on_labels(labels, da, weights, name=None, dim=None, dtyp
     )
 
     std_da = create_dataarray(
-        stats_array[..., 1],
+        std_values,
         (dim,),
         f"{name}_{da.name}_std",
         long_name=f"Standard deviation of {long_name} for each {dim}",
@@ -392,7 +411,7 @@ def weighted_statistics_on_labels(labels, da, weights, name=None, dim=None, dtyp
         dtype=dtype,
     )
     max_da = create_dataarray(
-        stats_array[..., 2],
+        max_values,
         (dim,),
         f"{name}_{da.name}_max",
         long_name=f"Maximum of {long_name} for each {dim}",
@@ -400,7 +419,7 @@ def weighted_statistics_on_labels(labels, da, weights, name=None, dim=None, dtyp
         dtype=dtype,
     )
     min_da = create_dataarray(
-        stats_array[..., 3],
+        min_values,
         (dim,),
         f"{name}_{da.name}_min",
         long_name=f"Minimum of {long_name} for each {dim}",
@@ -254,6 +254,7 @@ def convolve(
     dtype: type = np.float32,
     fill_value: float = np.nan,
     func: Callable | None = None,
+    res: np.ndarray | None = None,
 ) -> np.ndarray:
     """
     Convolve a sequence of images using optical flow vectors to offset adjacent
@@ -281,6 +282,10 @@ def convolve(
     func : callable, optional (default : None)
         The function to be applied to the convolved data at each time step. If
             None, the convolution will return all the convolved pixel locations.
+    res : numpy.ndarray, optional (default : None)
+        Array to insert the output into. If None, a new array will be created.
+            If func is provided, res may be the data array itself to perform
+            the convolution in place; otherwise it must not overlap data
 
     Returns
     -------
@@ -293,10 +298,22 @@ def convolve(
     if isinstance(data, xr.DataArray):
         data = data.to_numpy()
 
+    in_place = False
     if func is not None:
-        res = np.full(data.shape, fill_value, dtype=dtype)
+        if res is None:
+            res = np.full(data.shape, fill_value, dtype=dtype)
+        else:
+            # Writing in place is safe for the func path, as each output frame
+            # is held back until the matching input frame has been read for
+            # the last time
+            in_place = np.shares_memory(res, data)
+            if in_place:
+                pending = np.empty(data.shape[1:], dtype=dtype)
     else:
-        res = np.full((n_struct,) + data.shape, fill_value, dtype=dtype)
+        if res is None:
+            res = np.full((n_struct,) + data.shape, fill_value, dtype=dtype)
+        elif np.shares_memory(res, data):
+            raise ValueError("res must not overlap data when func is None")
 
     h, w = data.shape[1:]
     grid_locs = np.stack(np.meshgrid(np.arange(w), np.arange(h)), -1)
@@ -314,7 +331,7 @@ def convolve(
             next_frame = data[i + 1]
 
         if func is not None:
-            res[i] = func(
+            step_res = func(
                 convolve_step(
                     prev_frame,
                     step_frame,
@@ -329,6 +346,14 @@ def convolve(
                     grid_locs=grid_locs,
                 )
             )
+            if in_place:
+                if i > 0:
+                    wh_nan = np.isnan(data[i - 1])
+                    res[i - 1] = pending
+                    res[i - 1][wh_nan] = fill_value
+                np.copyto(pending, step_res)
+            else:
+                res[i] = step_res
         else:
             res[:, i] = convolve_step(
                 prev_frame,
@@ -344,5 +369,10 @@ def convolve(
                 grid_locs=grid_locs,
             )
     if func is not None:
-        res[np.isnan(data)] = fill_value
+        if in_place:
+            wh_nan = np.isnan(data[-1])
+            res[-1] = pending
+            res[-1][wh_nan] = fill_value
+        else:
+            res[np.isnan(data)] = fill_value
     return res
@@ -8,7 +8,7 @@ from skimage.feature import peak_local_max
 from tobac_flow.analysis import (
     filter_labels_by_length,
     filter_labels_by_mask,
-    filter_labels_by_length_and_multimask_legacy,
+    filter_labels_by_length_and_multimask,
     find_object_lengths,
     mask_labels,
     remap_labels,
@@ -53,7 +53,10 @@ def filtered_tdiff(flow, raw_diff):
         raw_diff, structure=t_struct, func=lambda x: np.nanmean(x, 0)
     )
     # filtered_diff = flow.convolve(
-    #     filtered_diff, structure=t_struct, func=lambda x: np.nanmax(x, 0)
+    #     filtered_diff,
+    #     structure=t_struct,
+    #     func=lambda x: np.nanmax(x, 0),
+    #     res=filtered_diff,
     # )
 
     return filtered_diff
@@ -61,42 +64,55 @@ def filtered_tdiff(flow, raw_diff):
 
 # Get a mask which only picks up where the curvature field is positive or negative
 def get_curvature_filter(field, sigma=2, threshold=0, direction="negative"):
-    smoothed_field = ndi.gaussian_filter(field, (0, sigma, sigma))
-    x_diff = np.zeros(field.shape)
-    x_diff[:, :, 1:-1] = np.diff(smoothed_field, n=2, axis=2)
+    if direction not in ("negative", "positive"):
+        raise ValueError("Direction must be either positive or negative")
 
-    y_diff = np.zeros(field.shape)
-    y_diff[:, 1:-1] = np.diff(smoothed_field, n=2, axis=1)
+    # Separable smoothing over the spatial axes only, skipping the no-op
+    # pass along the time axis that a (0, sigma, sigma) filter would run.
+    # Smoothing in float32 halves the bytes moved for float64 input fields
+    smoothed_field = ndi.gaussian_filter1d(field, sigma, axis=1, output=np.float32)
+    ndi.gaussian_filter1d(smoothed_field, sigma, axis=2, output=smoothed_field)
+    x_diff = np.diff(smoothed_field, n=2, axis=2)
+    y_diff = np.diff(smoothed_field, n=2, axis=1)
 
     s_struct = ndi.generate_binary_structure(3, 1)
     s_struct[0] = 0
     s_struct[2] = 0
 
+    # Threshold the second differences directly into the interior of a single
+    # boolean array; the zero-padded borders of the old full-size float arrays
+    # could never pass the threshold
+    curvature_cond = np.zeros(field.shape, dtype=bool)
     if direction == "negative":
-        curvature_filter = ndi.binary_opening(
-            ndi.binary_fill_holes(
-                np.logical_and(x_diff < -threshold, y_diff < -threshold),
-                structure=s_struct,
-            ),
-            structure=s_struct,
-        )
-    elif direction == "positive":
-        curvature_filter = ndi.binary_opening(
-            ndi.binary_fill_holes(
-                np.logical_and(x_diff > threshold, y_diff > threshold),
-                structure=s_struct,
-            ),
-            structure=s_struct,
+        np.logical_and(
+            x_diff[:, 1:-1, :] < -threshold,
+            y_diff[:, :, 1:-1] < -threshold,
+            out=curvature_cond[:, 1:-1, 1:-1],
         )
     else:
-        raise ValueError("Direction must be either positive or negative")
+        np.logical_and(
+            x_diff[:, 1:-1, :] > threshold,
+            y_diff[:, :, 1:-1] > threshold,
+            out=curvature_cond[:, 1:-1, 1:-1],
+        )
+
+    # Open before filling holes: the opening removes the isolated noise pixels
+    # first, so the costlier hole-filling runs on a much smaller foreground
+    curvature_filter = ndi.binary_fill_holes(
+        ndi.binary_opening(curvature_cond, structure=s_struct),
+        structure=s_struct,
+    )
     return curvature_filter
 
 
 # Detect regions of growth in the the wvd field
 def detect_growth_markers(flow, wvd):
+    # Keep the time differential in float32: flow.diff already returns
+    # float32, so dividing by a float32 time step avoids upcasting the whole
+    # array to float64
     wvd_diff_raw = (
-        flow.diff(wvd) / get_time_diff_from_coord(wvd.t)[:, np.newaxis, np.newaxis]
+        flow.diff(wvd)
+        / get_time_diff_from_coord(wvd.t).astype(np.float32)[:, np.newaxis, np.newaxis]
     )
 
     wvd_diff_smoothed = filtered_tdiff(flow, wvd_diff_raw)
@@ -110,12 +126,21 @@ def detect_growth_markers(flow, wvd):
         ndi.binary_opening(wvd_diff_filtered >= 0.25, structure=s_struct)
     )
 
-    marker_labels = filter_labels_by_length(marker_labels, 3)
-    marker_labels = filter_labels_by_mask(marker_labels, wvd_diff_filtered >= 0.5)
+    # Compute the label count and object slices once and pass them through the
+    # filter chain, rather than re-scanning the full label array in each filter
+    nlabels = int(marker_labels.max())
+    object_slices = ndi.find_objects(marker_labels, max_label=nlabels)
     if isinstance(wvd, xr.DataArray):
-        marker_labels = filter_labels_by_mask(marker_labels, wvd.data >= -5)
+        wvd_data = wvd.data
     else:
-        marker_labels = filter_labels_by_mask(marker_labels, wvd >= -5)
+        wvd_data = wvd
+    marker_labels = filter_labels_by_length_and_multimask(
+        marker_labels,
+        [wvd_diff_filtered >= 0.5, wvd_data >= -5],
+        3,
+        nlabels=nlabels,
+        object_slices=object_slices,
+    )
 
     if isinstance(wvd, xr.DataArray):
         wvd_diff_raw = xr.DataArray(wvd_diff_raw, wvd.coords, wvd.dims)
@@ -127,26 +152,27 @@ def detect_growth_markers(flow, wvd):
 def nan_gaussian_filter(a, *args, propagate_nan=True, **kwargs):
     wh_nan = np.isnan(a)
 
-    a0 = a.copy()
-    a0[wh_nan] = 0
-
-    c = np.ones_like(a)
-    c[wh_nan] = 0
+    # Filter the zero-filled data and the weights in place, then normalise
+    # into the filtered buffer, avoiding separate output allocations
+    a0 = np.where(wh_nan, 0, a)
+    ndi.gaussian_filter(a0, *args, output=a0, **kwargs)
 
-    a0_gaussian = ndi.gaussian_filter(a0, *args, **kwargs)
-    c_gaussian = ndi.gaussian_filter(c, *args, **kwargs)
-    c_gaussian[c_gaussian == 0] = np.nan
+    c = np.logical_not(wh_nan).astype(np.float32)
+    ndi.gaussian_filter(c, *args, output=c, **kwargs)
 
-    result = a0_gaussian / c_gaussian
+    wh_zero_weight = c == 0
+    np.divide(a0, c, out=a0, where=np.logical_not(wh_zero_weight))
+    a0[wh_zero_weight] = np.nan
 
     if propagate_nan:
-        result[wh_nan] = np.nan
+        a0[wh_nan] = np.nan
 
-    return result
+    return a0
 
 
 def get_peak_filter(field, sigma=2, min_distance=10, direction="negative"):
-    smoothed_field = ndi.gaussian_filter(field, (0, sigma, sigma))
+    smoothed_field = ndi.gaussian_filter1d(field, sigma, axis=1, output=np.float32)
+    ndi.gaussian_filter1d(smoothed_field, sigma, axis=2, output=smoothed_field)
     peak_filter = np.zeros(field.shape, dtype=np.int32)
     if direction == "negative":
         for i in range(field.shape[0]):
@@ -173,7 +199,7 @@ def get_growth_rate(flow, field, method: str = "linear"):
     """
     growth_rate = (
         flow.diff(field, method=method)
-        / get_time_diff_from_coord(field.t)[:, np.newaxis, np.newaxis]
+        / get_time_diff_from_coord(field.t).astype(np.float32)[:, np.newaxis, np.newaxis]
     )
 
     s_struct = ndi.generate_binary_structure(3, 1)
@@ -194,6 +220,7 @@ def get_growth_rate(flow, field, method: str = "linear"):
     #     structure=ndi.generate_binary_structure(3, 1),
     #     func=lambda x: np.nanmax(x, 0),
     #     method=method,
+    #     res=growth_rate,
     # )
 
     return growth_rate
@@ -212,10 +239,13 @@ def detect_growth_markers_multichannel(
 ):
     wvd_diff_smoothed = filtered_tdiff(
         flow,
-        flow.diff(wvd) / get_time_diff_from_coord(wvd.t)[:, np.newaxis, np.newaxis],
+        flow.diff(wvd)
+        / get_time_diff_from_coord(wvd.t).astype(np.float32)[:, np.newaxis, np.newaxis],
     )
     bt_diff_smoothed = filtered_tdiff(
-        flow, flow.diff(bt) / get_time_diff_from_coord(bt.t)[:, np.newaxis, np.newaxis]
+        flow,
+        flow.diff(bt)
+        / get_time_diff_from_coord(bt.t).astype(np.float32)[:, np.newaxis, np.newaxis],
     )
 
     markers = np.logical_or(
@@ -233,7 +263,9 @@ def detect_growth_markers_multichannel(
 
     # markers = filter_labels_by_length(markers, min_length)
     if np.count_nonzero(markers) > 0:
-        markers = filter_labels_by_length_and_multimask_legacy(
+        nlabels = int(markers.max())
+        object_slices = ndi.find_objects(markers, max_label=nlabels)
+        markers = filter_labels_by_length_and_multimask(
             markers,
             [
                 wvd_diff_smoothed >= upper_threshold,
@@ -241,6 +273,8 @@ def detect_growth_markers_multichannel(
                 wvd.data > -5,
             ],
             min_length,
+            nlabels=nlabels,
+            object_slices=object_slices,
         )
     else:
         warnings.warn("No regions detected in labeled array", RuntimeWarning)
@@ -264,14 +298,15 @@ def edge_watershed(
     verbose=False,
 ):
     if isinstance(field, xr.DataArray):
-        field = np.maximum(np.minimum(field.data, upper_threshold), lower_threshold)
-    else:
-        field = np.maximum(np.minimum(field, upper_threshold), lower_threshold)
+        field = field.data
+    field = np.clip(field, lower_threshold, upper_threshold)
 
     if isinstance(markers, xr.DataArray):
         markers = markers.data
 
-    field[markers != 0] = upper_threshold
+    # putmask treats nonzero markers as True and avoids the boolean-index
+    # temporary of field[markers != 0] = upper_threshold
+    np.putmask(field, markers, upper_threshold)
 
     s_struct = np.ones([1, 3, 3])
     mask = ndi.binary_erosion(
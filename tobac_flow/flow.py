@@ -110,6 +110,7 @@ class Flow(Abstract_Flow):
         fill_value: float = np.nan,
         dtype: type = np.float32,
         func: Callable | None = None,
+        res: np.ndarray | None = None,
     ) -> np.ndarray:
         """
         Convolve a sequence of images using optical flow vectors to offset adjacent
@@ -133,6 +134,10 @@ class Flow(Abstract_Flow):
         func : function, optional (default : np.nan)
             The function to be applied to the convolved data at each time step. If
                 None, the convolution will return all the convolved pixel locations.
+        res : numpy.ndarray, optional (default : None)
+            Array to insert the output into. If None, a new array will be
+                created. If func is provided, res may be the data array itself
+                to perform the convolution in place
 
         Returns
         -------
@@ -152,6 +157,7 @@ class Flow(Abstract_Flow):
             dtype=dtype,
             fill_value=fill_value,
             func=func,
+            res=res,
         )
 
         return output
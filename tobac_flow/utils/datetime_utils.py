@@ -5,6 +5,31 @@ import xarray as xr
 from datetime import datetime, timedelta
 from dateutil.parser import parse as parse_date
 
+# Fixed format of the date stamps following _S and _E in tobac-flow filenames
+FILENAME_DATE_FORMAT = "%Y%m%d_%H%M%S"
+
+
+def _parse_filename_date(date_str: str) -> datetime:
+    """
+    Parse the fixed-format date stamp embedded in tobac-flow filenames,
+    falling back to (much slower) fuzzy dateutil parsing for filenames using
+    other formats
+
+    Parameters
+    ----------
+    date_str : str
+        date stamp to parse
+
+    Returns
+    -------
+    datetime
+        parsed date as a python datetime object
+    """
+    try:
+        return datetime.strptime(date_str, FILENAME_DATE_FORMAT)
+    except ValueError:
+        return parse_date(date_str, fuzzy=True)
+
 
 def get_dates_from_filename(filename: str | pathlib.Path) -> tuple[datetime, datetime]:
     """
@@ -27,16 +52,15 @@ def get_dates_from_filename(filename: str | pathlib.Path) -> tuple[datetime, dat
         If filename is neither a string or pathlib Path object
     """
     if isinstance(filename, str):
-        start_date = parse_date(
-            filename.split("/")[-1].split("_S")[-1][:15], fuzzy=True
-        )
-        end_date = parse_date(filename.split("/")[-1].split("_E")[-1][:15], fuzzy=True)
+        name = filename.split("/")[-1]
     elif isinstance(filename, pathlib.Path):
-        start_date = parse_date(filename.name.split("_S")[-1][:15], fuzzy=True)
-        end_date = parse_date(filename.name.split("_E")[-1][:15], fuzzy=True)
+        name = filename.name
     else:
         raise ValueError("filename parameter must be either a string or a Path object")
 
+    start_date = _parse_filename_date(name.split("_S")[-1][:15])
+    end_date = _parse_filename_date(name.split("_E")[-1][:15])
+
     return start_date, end_date
 
 
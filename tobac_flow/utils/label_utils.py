@@ -1,8 +1,74 @@
 from multiprocessing import Value
+import warnings
 import numpy as np
 import scipy.ndimage as ndi
 from typing import Callable
 
+# Reductions with native single-pass scipy.ndimage counterparts. The boolean
+# marks the variants which exclude NaN values. np.max and np.min are not
+# included as ndi.maximum and ndi.minimum do not propagate NaN values
+_NDI_REDUCTIONS = {
+    np.mean: (ndi.mean, False),
+    np.nanmean: (ndi.mean, True),
+    np.std: (ndi.standard_deviation, False),
+    np.nanstd: (ndi.standard_deviation, True),
+    np.nanmax: (ndi.maximum, True),
+    np.nanmin: (ndi.minimum, True),
+}
+
+
+def _reduce_labels_ndi(
+    labels: np.ndarray[int],
+    field: np.ndarray,
+    func: Callable,
+    index: np.ndarray[int],
+    default: None | float,
+) -> np.ndarray | None:
+    """
+    Evaluate a recognised reduction over each labelled region using its
+        single-pass scipy.ndimage implementation, avoiding the full sort of
+        the label array required by the general comprehension path. Returns
+        None if the fast path cannot reproduce the comprehension result for
+        the given inputs
+    """
+    ndi_func, skip_nan = _NDI_REDUCTIONS[func]
+    index = np.asarray(index)
+    # Negative labels cannot be counted with bincount, and NaN exclusion works
+    # by moving NaN values into the background label, so label 0 itself cannot
+    # be reduced on this path
+    if index.size == 0 or np.min(labels) < 0 or np.min(index) < 1:
+        return None
+
+    minlength = int(np.max(index)) + 1
+    counts = np.bincount(labels.ravel(), minlength=minlength)
+    wh_empty = counts[index] == 0
+    if np.any(wh_empty) and default is None:
+        return None
+
+    if skip_nan and np.issubdtype(field.dtype, np.floating):
+        wh_nan = np.isnan(field)
+        if np.any(wh_nan):
+            labels = np.where(wh_nan, 0, labels)
+            counts_masked = np.bincount(labels.ravel(), minlength=minlength)
+        else:
+            counts_masked = counts
+    else:
+        counts_masked = counts
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        result = np.asarray(ndi_func(field, labels, index), dtype=np.float64)
+
+    # ndi.maximum and ndi.minimum return 0 for empty labels, where np.nanmax
+    # and np.nanmin return NaN
+    if ndi_func in (ndi.maximum, ndi.minimum):
+        result[counts_masked[index] == 0] = np.nan
+
+    if np.any(wh_empty):
+        result[wh_empty] = default
+
+    return result
+
 
 def labeled_comprehension(
     field: np.ndarray,
@@ -81,6 +147,21 @@ def apply_func_to_labels(
     default: None | float, optional (default: None)
         default value to return in a region has no values
     """
+    if (
+        len(fields) == 1
+        and func in _NDI_REDUCTIONS
+        and fields[0].shape == labels.shape
+    ):
+        result = _reduce_labels_ndi(
+            labels,
+            fields[0],
+            func,
+            np.arange(1, np.max(labels) + 1) if index is None else index,
+            default,
+        )
+        if result is not None:
+            return result.squeeze()
+
     broadcast_fields = np.broadcast_arrays(labels, *fields)
     broadcast_labels = broadcast_fields[0]
     broadcast_fields = broadcast_fields[1:]
@@ -1,6 +1,8 @@
 import numpy as np
 from typing import Callable
 
+from tobac_flow.utils.label_utils import _NDI_REDUCTIONS, _reduce_labels_ndi
+
 
 def apply_func_to_labels(
     labels: np.ndarray[int],
@@ -15,6 +17,12 @@ def apply_func_to_labels(
     """
     if labels.shape != field.shape:
         raise ValueError("Input labels and field do not have the same shape")
+    if func in _NDI_REDUCTIONS:
+        result = _reduce_labels_ndi(
+            labels, field, func, np.arange(1, np.max(labels) + 1), default
+        )
+        if result is not None:
+            return result
     bins = np.cumsum(np.bincount(labels.ravel()))
     args = np.argsort(labels.ravel())
     return np.array(